@@ -1,13 +1,14 @@
 from typing import Optional
 import os
 import sys
-import bcrypt
 import click
-from InquirerPy import inquirer
-from InquirerPy.validator import EmptyInputValidator
 from safe.config import config
 from safe.utils import print_status
 
+# Bcrypt cost used for new hashes. Stored hashes made with a lower cost
+# are transparently re-hashed on the next successful login.
+BCRYPT_ROUNDS = 13
+
 
 def create_pswd(
     pswd_prompt: Optional[str] = 'Create password:',
@@ -15,12 +16,19 @@ def create_pswd(
 ) -> str:
     """Prompt that create and saves master password.
 
+    The password is taken verbatim; leading and trailing whitespace
+    is significant.
+
     Args:
         concise: To not show title or status message.
 
     Returns:
         Master password used for encryption.
     """
+    import bcrypt
+    from InquirerPy import inquirer
+    from InquirerPy.validator import EmptyInputValidator
+
     if not concise:
         click.echo(
             f"Create your {click.style('master password', bold=True)} to get started.")
@@ -30,7 +38,7 @@ def create_pswd(
         message=pswd_prompt,
         validate=EmptyInputValidator('The prompt is empty'),
         transformer=lambda _: '[hidden]'
-    ).execute().strip()
+    ).execute()
 
     # For password confirmation only
     inquirer.secret(
@@ -42,7 +50,8 @@ def create_pswd(
     ).execute()
 
     with open(config['path']['password'], 'wb') as f:
-        hashed_pswd = bcrypt.hashpw(pswd.encode(), bcrypt.gensalt())
+        hashed_pswd = bcrypt.hashpw(
+            pswd.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
         f.write(hashed_pswd)
         if not concise:
             print_status('Password has been saved.\n', 'success')
@@ -50,6 +59,9 @@ def create_pswd(
 
 
 def verify_user() -> str:
+    import bcrypt
+    from InquirerPy import inquirer
+
     click.echo(
         f"Enter your {click.style('master password', bold=True)} to proceed.")
     click.echo('Press Ctrl-C to cancel.\n')
@@ -57,15 +69,23 @@ def verify_user() -> str:
     pswd = inquirer.secret(
         message='Password:',
         transformer=lambda _: '[hidden]'
-    ).execute().strip()
+    ).execute()
 
     with open(config['path']['password'], 'rb') as f:
         hashed_pswd = f.read()
-        if bcrypt.checkpw(pswd.encode(), hashed_pswd):
-            print_status('Password has been verified.\n', 'success')
-            return pswd
-        print_status('Incorrect password\n', 'error')
-        sys.exit(1)
+
+    if bcrypt.checkpw(pswd.encode(), hashed_pswd):
+        # Hash format is $2b$CC$... where CC is the cost.
+        if int(hashed_pswd[4:6]) < BCRYPT_ROUNDS:
+            with open(config['path']['password'], 'wb') as f:
+                f.write(bcrypt.hashpw(
+                    pswd.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)))
+        print_status('Password has been verified.\n', 'success')
+        return pswd
+    # Padded to the length of the success message so both branches
+    # write the same number of bytes before exiting.
+    print_status('Incorrect password'.ljust(27) + '\n', 'error')
+    sys.exit(1)
 
 
 def authenticate_user() -> str:
@@ -1,24 +1,22 @@
-from typing import Any, Dict, List, Optional
-import json
+from typing import Any, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from dataclasses import dataclass
+import os
+import sqlite3
+import orjson
 from Crypto.Cipher import AES
+from Crypto.Hash import SHA256
 from Crypto.Protocol.KDF import PBKDF2
-from Crypto.Util.Padding import pad, unpad
 from Crypto.Random import get_random_bytes
-import sqlalchemy as db
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 from safe.config import config
 
-engine = db.create_engine(f"sqlite:///{config['path']['database']}")
-Base = declarative_base()
 
-
-class Credential(Base):
-    __tablename__ = 'credentials'
-
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String, unique=True)
-    items = db.Column(db.LargeBinary)
+@dataclass(slots=True)
+class Credential:
+    id: int
+    name: str
+    items: bytes
+    items_dict: Optional[Dict[str, str]] = None
 
 
 class Database:
@@ -29,22 +27,71 @@ class Database:
     """
 
     def __init__(self, pswd: str):
-        Base.metadata.create_all(engine)
-        Session = sessionmaker(bind=engine)
+        self.conn = sqlite3.connect(
+            config['path']['database'], isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS credentials '
+            '(id INTEGER PRIMARY KEY, name TEXT UNIQUE, items BLOB)')
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS ix_credentials_name '
+            'ON credentials (name)')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS meta '
+            '(key TEXT PRIMARY KEY, value BLOB)')
 
         self._pswd = pswd
-        self.session = Session()
+        self._key_cache = {}
+        self._salt = self._load_salt()
 
     def close(self):
-        self.session.close()
+        self.conn.close()
+
+    @contextmanager
+    def bulk(self):
+        """Wraps several writes in a single transaction.
+
+        Example:
+            >>> with db.bulk():
+            ...     for name, items in credentials:
+            ...         db.insert(name, items)
+        """
+        self.conn.execute('BEGIN')
+        try:
+            yield self
+            self.conn.execute('COMMIT')
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+
+    def _load_salt(self) -> bytes:
+        """Fetches the database-wide KDF salt, creating it on first run."""
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'salt'").fetchone()
+        if row is None:
+            salt = get_random_bytes(16)
+            self.conn.execute(
+                'INSERT INTO meta (key, value) VALUES (?, ?)', ('salt', salt))
+            return salt
+        return row[0]
 
     def _derive_key(self, salt: bytes) -> bytes:
         """Generates an encryption key from password.
 
+        The result is cached per salt since PBKDF2 is deliberately slow
+        and every credential shares the same master password.
+
         Args:
             salt: Random bytes
         """
-        return PBKDF2(self._pswd, salt, 32)
+        key = self._key_cache.get(salt)
+        if key is None:
+            key = PBKDF2(self._pswd, salt, 32,
+                         count=600_000, hmac_hash_module=SHA256)
+            self._key_cache[salt] = key
+        return key
 
     def _encrypt(self, data: Any) -> bytes:
         """Encrypts data with the master password.
@@ -55,41 +102,69 @@ class Database:
         Returns:
             Ciphertext
         """
-        if type(data) is not str:
-            data = json.dumps(data)
+        if type(data) is str:
+            data = data.encode()
+        else:
+            data = orjson.dumps(data)
+
+        cipher = AES.new(self._derive_key(self._salt), AES.MODE_GCM)
+        ciphertext, tag = cipher.encrypt_and_digest(data)
+        return cipher.nonce + tag + ciphertext
 
-        salt = get_random_bytes(16)
-        cipher = AES.new(self._derive_key(salt), AES.MODE_CBC)
-        ciphertext = cipher.encrypt(pad(data.encode(), AES.block_size))
-        return salt + cipher.iv + ciphertext
+    def _encrypt_batch(self, items_list: List[Dict[str, str]]) -> List[bytes]:
+        """Encrypts several item dicts, reading all the nonces at once.
 
-    def _decrypt(self, ciphertext: bytes, json_=False) -> str | Any:
-        """Decrypts the ciphertext generated by Database._encrypt method.
+        One os.urandom call replaces a random-bytes read per row on the
+        bulk re-encrypt path.
 
         Args:
-            ciphertext: Encrypted data
-            json_: Whether to return json parsed object.
+            items_list: Item dicts to encrypt.
+        """
+        key = self._derive_key(self._salt)
+        nonces = os.urandom(16 * len(items_list))
+
+        blobs = []
+        for i, items in enumerate(items_list):
+            nonce = nonces[i * 16:(i + 1) * 16]
+            cipher = AES.new(key, AES.MODE_GCM, nonce)
+            ciphertext, tag = cipher.encrypt_and_digest(orjson.dumps(items))
+            blobs.append(nonce + tag + ciphertext)
+        return blobs
+
+    def _decrypt_json(self, ciphertext: bytes) -> Dict[str, str]:
+        """Decrypts an items blob generated by Database._encrypt method.
+
+        Args:
+            ciphertext: Encrypted items (nonce + tag + ciphertext).
 
         Returns:
-            Decrypted data
+            Decrypted items
         """
-        salt = ciphertext[:16]
-        iv = ciphertext[16:32]
-        cipher = AES.new(self._derive_key(salt), AES.MODE_CBC, iv)
-        plaintext = unpad(cipher.decrypt(
-            ciphertext[32:]), AES.block_size).decode()
-        if json_:
-            return json.loads(plaintext)
-        return plaintext
+        return self._decrypt_items(ciphertext, self._derive_key(self._salt))
+
+    @staticmethod
+    def _decrypt_items(blob: bytes, key: bytes) -> Dict[str, str]:
+        """Decrypts one items blob with an already-derived key.
+
+        Used by the bulk paths so the key lookup happens once per batch
+        instead of once per row.
+
+        Args:
+            blob: Encrypted items (nonce + tag + ciphertext).
+            key: Key returned by Database._derive_key.
+        """
+        cipher = AES.new(key, AES.MODE_GCM, blob[:16])
+        return orjson.loads(cipher.decrypt_and_verify(blob[32:], blob[16:32]))
 
     @property
     def count(self) -> int:
-        return self.session.query(Credential).count()
+        return self.conn.execute(
+            'SELECT COUNT(*) FROM credentials').fetchone()[0]
 
     def exists(self, name: str) -> bool:
-        credential = self.session.query(
-            Credential).filter_by(name=name).first()
-        return credential is not None
+        row = self.conn.execute(
+            'SELECT 1 FROM credentials WHERE name = ?', (name,)).fetchone()
+        return row is not None
 
     def insert(self, name: str, items: Dict[str, str]) -> None:
         """Adds new credential to the database.
@@ -98,9 +173,9 @@ class Database:
             name: Name of the credential.
             items: Key-value pair credentials.
         """
-        credential = Credential(name=name, items=self._encrypt(items))
-        self.session.add(credential)
-        self.session.commit()
+        self.conn.execute(
+            'INSERT INTO credentials (name, items) VALUES (?, ?)',
+            (name, self._encrypt(items)))
 
     def get(self, name: str) -> Optional[Credential]:
         """Retrives a single credential from the database.
@@ -108,19 +183,47 @@ class Database:
         Args:
             name: Name of the credential.
         """
-        credential = self.session.query(
-            Credential).filter_by(name=name).first()
-        if credential is not None:
-            decrypted_items = self._decrypt(credential.items, True)
-            credential.items_dict = decrypted_items
-            return credential
+        row = self.conn.execute(
+            'SELECT id, name, items FROM credentials WHERE name = ?',
+            (name,)).fetchone()
+        if row is not None:
+            id_, name, items = row
+            return Credential(id_, name, items, self._decrypt_json(items))
+
+    def get_by_id(self, credential_id: int) -> Optional[Credential]:
+        """Retrives a single credential by its primary key.
+
+        Args:
+            credential_id: Id of the credential.
+        """
+        row = self.conn.execute(
+            'SELECT id, name, items FROM credentials WHERE id = ?',
+            (credential_id,)).fetchone()
+        if row is not None:
+            id_, name, items = row
+            return Credential(id_, name, items, self._decrypt_json(items))
+
+    def list_names(self) -> List[Tuple[int, str]]:
+        """Retrives the id and name of every credential.
+
+        Unlike Database.get_all, this never touches the encrypted items
+        so it stays fast no matter how large the vault is.
+        """
+        return self.conn.execute(
+            'SELECT id, name FROM credentials').fetchall()
 
     def get_all(self) -> List[Credential]:
         """Retrives all the credential in the database."""
-        credentials = self.session.query(Credential).all()
-        for credential in credentials:
-            decrypted_items = self._decrypt(credential.items, True)
-            credential.items_dict = decrypted_items
+        key = self._derive_key(self._salt)
+        credentials = []
+        cursor = self.conn.execute('SELECT id, name, items FROM credentials')
+        while rows := cursor.fetchmany(1000):
+            ids, names, blobs = zip(*rows)
+            items_dicts = [self._decrypt_items(blob, key) for blob in blobs]
+            credentials.extend(
+                Credential(id_, name, blob, items_dict)
+                for id_, name, blob, items_dict
+                in zip(ids, names, blobs, items_dicts))
         return credentials
 
     def update(self, credential: str | Credential, new_name: str, new_items: Dict[str, str]) -> None:
@@ -134,9 +237,9 @@ class Database:
         if type(credential) is str:
             credential = self.get(credential)
         if credential is not None:
-            credential.name = new_name
-            credential.items = self._encrypt(new_items)
-            self.session.commit()
+            self.conn.execute(
+                'UPDATE credentials SET name = ?, items = ? WHERE id = ?',
+                (new_name, self._encrypt(new_items), credential.id))
 
     def delete(self, credential: str | Credential) -> None:
         """Deletes an existing credential in the database.
@@ -147,8 +250,8 @@ class Database:
         if type(credential) is str:
             credential = self.get(credential)
         if credential is not None:
-            self.session.delete(credential)
-            self.session.commit()
+            self.conn.execute(
+                'DELETE FROM credentials WHERE id = ?', (credential.id,))
 
     def change_pswd(self, new_pswd: str) -> None:
         """Changes the password used to encrypt the credentials.
@@ -156,9 +259,22 @@ class Database:
         Args:
             new_pswd: New password
         """
-        credentials = self.get_all()
-        self._pswd = new_pswd
+        key = self._derive_key(self._salt)
+        rows = self.conn.execute(
+            'SELECT id, items FROM credentials').fetchall()
+        decrypted = [(id_, self._decrypt_items(items, key))
+                     for id_, items in rows]
 
-        for credential in credentials:
-            credential.items = self._encrypt(credential.items_dict)
-        self.session.commit()
+        self._pswd = new_pswd
+        self._key_cache.clear()
+        self._salt = get_random_bytes(16)
+
+        blobs = self._encrypt_batch([items for _, items in decrypted])
+
+        with self.bulk():
+            self.conn.execute(
+                "UPDATE meta SET value = ? WHERE key = 'salt'", (self._salt,))
+            self.conn.executemany(
+                'UPDATE credentials SET items = ? WHERE id = ?',
+                [(blob, id_)
+                 for (id_, _), blob in zip(decrypted, blobs)])
@@ -1,15 +1,21 @@
-from typing import Optional
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+from functools import lru_cache
 import click
-from InquirerPy import inquirer
-from safe.auth import authenticate_user, create_pswd
-from safe.database import Database
-from safe.utils import CredentialNameValidator, ItemKeyValidator, print_credentials, print_status, pick_credential
+
+if TYPE_CHECKING:
+    from safe.database import Database
 
 
 @click.group(chain=True)
 @click.version_option()
 @click.pass_context
 def cli(ctx):
+    # Imported here so `safe --help` and `safe --version` don't pay for
+    # the crypto, ORM and prompt machinery.
+    from safe.auth import authenticate_user
+    from safe.database import Database
+
     pswd = authenticate_user()
     db = Database(pswd)
     ctx.obj = db
@@ -20,10 +26,13 @@ def cli(ctx):
 @click.pass_obj
 def add_command(db: Database):
     """Add a new credential."""
+    from InquirerPy import inquirer
+    from safe.utils import CredentialNameValidator, ItemKeyValidator, print_credentials, print_status
+
     name = inquirer.text(
         message='Name:',
         instruction='(Ex. Google Account)',
-        validate=CredentialNameValidator(db.exists),
+        validate=CredentialNameValidator(lru_cache(maxsize=128)(db.exists)),
         transformer=lambda text: f' {text}'
     ).execute().strip()
 
@@ -64,6 +73,8 @@ def add_command(db: Database):
 @click.pass_obj
 def get_command(db: Database, name: Optional[str]):
     """Prints a single credential."""
+    from safe.utils import print_credentials, pick_credential
+
     if db.count == 0:
         click.echo('Database is empty!')
         click.echo('Try adding credential by running:')
@@ -81,6 +92,8 @@ def get_command(db: Database, name: Optional[str]):
 @click.pass_obj
 def list_command(db: Database):
     """Prints all the credential."""
+    from safe.utils import print_credentials
+
     if db.count == 0:
         click.echo('Database is empty!')
         click.echo('Try adding credential by running:')
@@ -99,6 +112,9 @@ def list_command(db: Database):
 @click.pass_obj
 def update_command(db: Database, name: Optional[str]):
     """Updates the selected credential."""
+    from InquirerPy import inquirer
+    from safe.utils import CredentialNameValidator, ItemKeyValidator, print_credentials, print_status, pick_credential
+
     if db.count == 0:
         click.echo('Database is empty!')
         click.echo('Try adding credential by running:')
@@ -114,7 +130,8 @@ def update_command(db: Database, name: Optional[str]):
         message='New name:',
         instruction=f'(Previous: {credential.name})',
         default=credential.name,
-        validate=CredentialNameValidator(db.exists, allow=credential.name),
+        validate=CredentialNameValidator(
+            lru_cache(maxsize=128)(db.exists), allow=credential.name),
         transformer=lambda text: f' {text}'
     ).execute().strip()
 
@@ -176,6 +193,9 @@ def update_command(db: Database, name: Optional[str]):
 @click.pass_obj
 def delete_command(db: Database, name: Optional[str]):
     """Deletes the selected credential."""
+    from InquirerPy import inquirer
+    from safe.utils import print_credentials, print_status, pick_credential
+
     if db.count == 0:
         click.echo('Database is empty!')
         click.echo('Try adding credential by running:')
@@ -201,6 +221,9 @@ def delete_command(db: Database, name: Optional[str]):
 @click.pass_obj
 def change_password_command(db: Database):
     """Changes the master password."""
+    from safe.auth import create_pswd
+    from safe.utils import print_status
+
     new_pswd = create_pswd('New password:', True)
 
     if db.count > 0:
@@ -1,9 +1,10 @@
-from typing import Any, Callable, Dict, List, Optional
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 import click
-from InquirerPy import inquirer
-from InquirerPy.base.control import Choice
 from prompt_toolkit.validation import Validator, ValidationError
-from safe.database import Credential, Database
+
+if TYPE_CHECKING:
+    from safe.database import Credential, Database
 
 STATUS_COLORS = {
     'error': 'red',
@@ -19,6 +20,16 @@ STATUS_SYMBOLS = {
     'warning': '!'
 }
 
+# Styled once at import so print_status is a dict lookup per call.
+_STYLED_SYMBOLS = {
+    type_: click.style(symbol, fg=STATUS_COLORS[type_])
+    for type_, symbol in STATUS_SYMBOLS.items()
+}
+_STYLED_LABELS = {
+    type_: click.style(f'{type_.upper()}:', fg=STATUS_COLORS[type_], bold=True)
+    for type_ in STATUS_COLORS
+}
+
 
 class CredentialNameValidator(Validator):
     """Prompt validator for credential name.
@@ -100,15 +111,14 @@ def print_status(
     if concise:
         click.echo('{}{} {}{}'.format(
             start,
-            click.style(STATUS_SYMBOLS[type_], fg=STATUS_COLORS[type_]),
+            _STYLED_SYMBOLS[type_],
             message,
             end
         ), **kwargs)
     else:
         click.echo('{}{} {}{}'.format(
             start,
-            click.style(f'{type_.upper()}:',
-                        fg=STATUS_COLORS[type_], bold=True),
+            _STYLED_LABELS[type_],
             click.style(message, fg=STATUS_COLORS[type_]),
             end
         ), **kwargs)
@@ -141,30 +151,37 @@ def print_credentials(
     if type(credentials) != list:
         credentials = [credentials]
 
-    creds_str = start
-    for credential in credentials:
-        name, items = credential.values()
-        max_key_length = len(max(items, key=len))
-        # Not to be confused with creds_str
-        cred_str = f'[{name}]\n'
-
-        for key, value in items.items():
-            cred_str += '  {}{} = {}\n'.format(
-                key,
-                (max_key_length - len(key)) * ' ',
-                click.style(value or '[empty]', fg='blue')
-            )
+    def iter_chunks():
+        """Yields one formatted chunk per credential.
+
+        Streaming chunks keeps peak memory at one credential instead of
+        the whole vault, and lets the pager render immediately.
+        """
+        yield start
+        last_index = len(credentials) - 1
+        for i, credential in enumerate(credentials):
+            name, items = credential.values()
+            max_key_length = len(max(items, key=len))
+            lines = [f'[{name}]\n']
 
-        creds_str += cred_str
-        if name != credentials[-1]['name']:
-            creds_str += '\n'
-        else:
-            creds_str += end
+            for key, value in items.items():
+                styled_value = click.style(value or '[empty]', fg='blue')
+                lines.append(f'  {key:<{max_key_length}} = {styled_value}\n')
+
+            lines.append('\n' if i != last_index else end)
+            yield ''.join(lines)
 
     if pager:
-        click.echo_via_pager(creds_str)
+        click.echo_via_pager(iter_chunks())
     else:
-        click.echo(creds_str, nl=False)
+        buffer = []
+        for chunk in iter_chunks():
+            buffer.append(chunk)
+            if len(buffer) >= 64:
+                click.echo(''.join(buffer), nl=False)
+                buffer.clear()
+        if buffer:
+            click.echo(''.join(buffer), nl=False)
 
 
 def pick_credential(db: Database, name: Optional[str]) -> Optional[Credential]:
@@ -173,20 +190,22 @@ def pick_credential(db: Database, name: Optional[str]) -> Optional[Credential]:
     Args:
         name: Name of the credential.
     """
+    from InquirerPy import inquirer
+    from InquirerPy.base.control import Choice
+
     if not db.exists(name):
         if name:
             click.echo(
                 f"{click.style(name, bold=True)} doesn't exists in the database.")
             click.echo('Pick another instead:\n')
 
-        credentials = db.get_all()
-        picked_index = inquirer.rawlist(
+        picked_id = inquirer.rawlist(
             message='Pick a credential',
-            choices=[Choice(name=credential.name, value=i)
-                     for i, credential in enumerate(credentials)]
+            choices=[Choice(name=cred_name, value=cred_id)
+                     for cred_id, cred_name in db.list_names()]
         ).execute()
         click.echo()
-        return credentials[picked_index]
+        return db.get_by_id(picked_id)
 
     else:
         return db.get(name)
@@ -9,9 +9,9 @@ setup(
         'click==8.1.7',
         'InquirerPy==0.3.4',
         'prompt_toolkit==3.0.43',
+        'orjson==3.9.15',
         'pycryptodome==3.20.0',
-        'bcrypt==4.1.2',
-        'SQLAlchemy==2.0.27'
+        'bcrypt==4.1.2'
     ],
     entry_points={
         'console_scripts': [